@@ -1,127 +1,49 @@
+import os
+
 import streamlit as st
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pacsv
+import pyarrow.parquet as pq
 import plotly.express as px
 import plotly.graph_objects as go
+from plotly.subplots import make_subplots
 
 st.set_page_config(page_title="Bike Rental Dashboard", layout="wide")
 
-@st.cache_data
-def load_data():
-    hour_df = pd.read_csv('data/hour.csv')
-    day_df = pd.read_csv('data/day.csv')
+# Compact dtypes: categorical codes fit in int8, counts in int32 and
+# normalized weather readings in float32
+COLUMN_DTYPES = {
+    'season': 'int8', 'yr': 'int8', 'mnth': 'int8', 'hr': 'int8',
+    'holiday': 'int8', 'weekday': 'int8', 'workingday': 'int8',
+    'weathersit': 'int8',
+    'casual': 'int32', 'registered': 'int32', 'cnt': 'int32',
+    'temp': 'float32', 'atemp': 'float32', 'hum': 'float32',
+    'windspeed': 'float32'
+}
+
+def read_dataset(name):
+    csv_path = f'data/{name}.csv'
+    parquet_path = f'data/{name}.parquet'
     
-    # Convert date columns
-    hour_df['dteday'] = pd.to_datetime(hour_df['dteday'])
-    day_df['dteday'] = pd.to_datetime(day_df['dteday'])
+    # Convert the CSV to Parquet once, then read typed columns directly
+    if (not os.path.exists(parquet_path)
+            or os.path.getmtime(parquet_path) < os.path.getmtime(csv_path)):
+        column_types = {col: pa.type_for_alias(dtype)
+                        for col, dtype in COLUMN_DTYPES.items()}
+        column_types['dteday'] = pa.timestamp('ns')
+        table = pacsv.read_csv(
+            csv_path,
+            convert_options=pacsv.ConvertOptions(column_types=column_types)
+        )
+        pq.write_table(table, parquet_path)
+        return table.to_pandas()
     
-    return hour_df, day_df
-
-def categorize(row):
-    if row['weathersit'] == 1 and row['temp'] > 0.6 and row['hum'] < 0.5:
-        return 'Ideal'
-    elif row['weathersit'] in [1, 2] and row['temp'] > 0.4 and row['hum'] < 0.7:
-        return 'Good'
-    elif row['weathersit'] in [2, 3] and row['temp'] > 0.2 and row['hum'] < 0.8:
-        return 'Moderate'
-    else:
-        return 'Poor'
-
-hour_df, day_df = load_data()
-
-# Title
-st.title("🚲 Bike Rental Analysis Dashboard")
-
-# Sidebar filters
-st.sidebar.header("Filters")
-date_range = st.sidebar.date_input(
-    "Select Date Range",
-    value=(hour_df['dteday'].min(), hour_df['dteday'].max()),
-    min_value=hour_df['dteday'].min(),
-    max_value=hour_df['dteday'].max()
-)
-
-# Add user type filter
-user_type = st.sidebar.selectbox(
-    "Select User Type",
-    ["All", "Casual", "Registered"]
-)
-
-filtered_df = hour_df[
-    (hour_df['dteday'].dt.date >= date_range[0]) &
-    (hour_df['dteday'].dt.date <= date_range[1])
-]
-
-st.subheader("Working days Impact Analysis")
-col1, col2, col3 = st.columns(3)
-with col1:
-    st.metric("Total Users", f"{filtered_df['cnt'].sum():,}")
-with col2:
-    st.metric("Casual Users", f"{filtered_df['casual'].sum():,}")
-with col3:
-    st.metric("Registered Users", f"{filtered_df['registered'].sum():,}")
-
-daily_data = filtered_df.groupby(['dteday', 'workingday']).agg({
-    'casual': 'sum',
-    'registered': 'sum',
-    'cnt': 'sum'
-}).reset_index()
-
-fig = go.Figure()
-
-# Modify the chart based on user type selection
-if user_type == "All":
-    y_column = 'cnt'
-    title_suffix = "Total"
-elif user_type == "Casual":
-    y_column = 'casual'
-    title_suffix = "Casual"
-else:
-    y_column = 'registered'
-    title_suffix = "Registered"
-
-fig.add_trace(
-    go.Scatter(
-        x=daily_data[daily_data['workingday'] == 1]['dteday'],
-        y=daily_data[daily_data['workingday'] == 1][y_column],
-        name="Working Day",
-        mode='markers',
-        marker=dict(color='blue', size=8),
-        hovertemplate="<b>Date:</b> %{x}<br><b>Users:</b> %{y}<br><b>Day Type:</b> Working Day<extra></extra>"
-    )
-)
-
-fig.add_trace(
-    go.Scatter(
-        x=daily_data[daily_data['workingday'] == 0]['dteday'],
-        y=daily_data[daily_data['workingday'] == 0][y_column],
-        name="Non-working Day",
-        mode='markers',
-        marker=dict(color='red', size=8),
-        hovertemplate="<b>Date:</b> %{x}<br><b>Users:</b> %{y}<br><b>Day Type:</b> Non-working Day<extra></extra>"
-    )
-)
-
-fig.update_layout(
-    title=f"Daily Bike Rentals - {title_suffix} Users",
-    xaxis_title="Date",
-    yaxis_title=f"Number of {title_suffix} Rentals",
-    hovermode='x unified',
-    showlegend=True,
-    legend=dict(
-        yanchor="top",
-        y=0.99,
-        xanchor="right",
-        x=0.99,
-        bgcolor="rgba(255, 255, 255, 0.8)",
-        bordercolor="rgba(0, 0, 0, 0.3)",
-        borderwidth=1
-    )
-)
-
-st.plotly_chart(fig, use_container_width=True)
-
-# Weather Impact Analysis
-st.subheader("Weather Impact Analysis")
+    # No-op for caches written with compact dtypes, narrows older ones
+    df = pd.read_parquet(parquet_path)
+    return df.astype({col: dtype for col, dtype in COLUMN_DTYPES.items()
+                      if col in df.columns}, copy=False)
 
 weather_desc = {
     1: "Clear/Partly Cloudy",
@@ -130,96 +52,314 @@ weather_desc = {
     4: "Heavy Rain/Ice Pallets"
 }
 
-filtered_df['weather_desc'] = filtered_df['weathersit'].map(weather_desc)
-
-tab1, tab2, tab3, tab4 = st.tabs(["Average Rentals by Weather", "Weather Factors vs Rentals", 
-                                 "Weather Rentals Correlation", "Advanced Analysis"])
-
-# Box Plot
-with tab1:
-    fig_weather = px.box(
-        filtered_df,
-        x='weather_desc',
-        y=['casual', 'registered', 'cnt'],
-        title="Rental Distribution by Weather Condition",
-        labels={'value': 'Number of Rentals', 'variable': 'User Type'},
-        color_discrete_sequence=px.colors.qualitative.Set3
+@st.cache_data
+def load_data():
+    hour_df = read_dataset('hour')
+    day_df = read_dataset('day')
+    
+    # Derived weather columns only depend on static data, build them once
+    hour_df['weather_desc'] = pd.Categorical.from_codes(
+        hour_df['weathersit'].to_numpy() - 1,
+        categories=[weather_desc[code] for code in sorted(weather_desc)],
+        ordered=True
     )
-    st.plotly_chart(fig_weather, use_container_width=True)
-
-with tab2:
-    # Temperature plot
-    fig_temp = px.scatter(
-        filtered_df,
-        x='temp',
-        y='cnt',
-        color='weather_desc',
-        title="Temperature vs Total Rentals",
-        labels={
-            'temp': 'Temperature (Normalized)',
-            'cnt': 'Total Rentals',
-            'weather_desc': 'Weather Condition'
-        },
-        opacity=0.6
+    
+    # Add weather category
+    ws = hour_df['weathersit'].to_numpy()
+    t = hour_df['temp'].to_numpy()
+    h = hour_df['hum'].to_numpy()
+    conds = [
+        (ws == 1) & (t > 0.6) & (h < 0.5),
+        np.isin(ws, [1, 2]) & (t > 0.4) & (h < 0.7),
+        np.isin(ws, [2, 3]) & (t > 0.2) & (h < 0.8)
+    ]
+    choices = ['Ideal', 'Good', 'Moderate']
+    hour_df['weather_category'] = pd.Categorical(
+        np.select(conds, choices, default='Poor'),
+        categories=['Ideal', 'Good', 'Moderate', 'Poor'],
+        ordered=True
     )
-    st.plotly_chart(fig_temp, use_container_width=True)
     
-    # Humidity plot
-    fig_hum = px.scatter(
-        filtered_df,
-        x='hum',
-        y='cnt',
-        color='weather_desc',
-        title="Humidity vs Total Rentals",
-        labels={
-            'hum': 'Humidity (Normalized)',
-            'cnt': 'Total Rentals',
-            'weather_desc': 'Weather Condition'
-        },
-        opacity=0.6
+    # Index by date so range filters are slices instead of full scans
+    hour_df = hour_df.sort_values('dteday', kind='stable')
+    hour_df = hour_df.set_index('dteday', drop=False).rename_axis(None)
+    
+    return hour_df, day_df
+
+MAX_SCATTER_POINTS = 2500
+
+def lttb_indices(x, y, n_out):
+    """Positions of the points kept by Largest-Triangle-Three-Buckets."""
+    n = len(x)
+    if n <= n_out or n_out < 3:
+        return np.arange(n)
+    
+    # LTTB walks the points in x order, so sort once and map back at the end
+    order = np.argsort(x, kind='stable')
+    xs = x[order].astype(np.float64)
+    ys = y[order].astype(np.float64)
+    
+    # First and last points are always kept, the rest is split into buckets
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    keep = np.empty(n_out, dtype=np.int64)
+    keep[0] = 0
+    keep[-1] = n - 1
+    
+    a = 0
+    for i in range(n_out - 2):
+        start, end = edges[i], edges[i + 1]
+        if i + 2 < len(edges):
+            next_start, next_end = edges[i + 1], edges[i + 2]
+        else:
+            next_start, next_end = n - 1, n
+        avg_x = xs[next_start:next_end].mean()
+        avg_y = ys[next_start:next_end].mean()
+        
+        # Keep the point forming the largest triangle with the previous
+        # kept point and the average of the next bucket
+        area = np.abs(
+            (xs[a] - avg_x) * (ys[start:end] - ys[a])
+            - (xs[a] - xs[start:end]) * (avg_y - ys[a])
+        )
+        a = start + int(area.argmax())
+        keep[i + 1] = a
+    
+    return order[keep]
+
+def downsample(df, x, y, n_out=MAX_SCATTER_POINTS):
+    idx = lttb_indices(df[x].to_numpy(), df[y].to_numpy(), n_out)
+    return df.iloc[np.sort(idx)]
+
+def build_box_fig(df, x, title):
+    """Box plot per user type from precomputed quartiles and Tukey fences."""
+    codes = df[x].cat.codes.to_numpy()
+    categories = df[x].cat.categories
+    
+    fig = go.Figure()
+    for col, color in zip(['casual', 'registered', 'cnt'], px.colors.qualitative.Set3):
+        vals = df[col].to_numpy()
+        stats = {'x': [], 'q1': [], 'median': [], 'q3': [],
+                 'lowerfence': [], 'upperfence': []}
+        for code, category in enumerate(categories):
+            group = vals[codes == code]
+            if len(group) == 0:
+                continue
+            q1, median, q3 = np.quantile(group, [0.25, 0.5, 0.75])
+            iqr = q3 - q1
+            inside = group[(group >= q1 - 1.5 * iqr) & (group <= q3 + 1.5 * iqr)]
+            stats['x'].append(category)
+            stats['q1'].append(q1)
+            stats['median'].append(median)
+            stats['q3'].append(q3)
+            stats['lowerfence'].append(inside.min())
+            stats['upperfence'].append(inside.max())
+        fig.add_trace(go.Box(name=col, marker_color=color, **stats))
+    
+    fig.update_layout(
+        title=title,
+        boxmode='group',
+        xaxis_title=x,
+        yaxis_title="Number of Rentals",
+        legend_title_text="User Type"
     )
-    st.plotly_chart(fig_hum, use_container_width=True)
+    return fig
+
+# Date-range aggregates are cached so reruns that only change the user type
+# or the active tab skip the groupby and correlation; load_data is only
+# consulted on a cache miss
+@st.cache_data
+def compute_daily(lo, hi):
+    hour_df, _ = load_data()
+    # Rows are already in date order, so the group sort is redundant
+    daily_data = hour_df.loc[lo:hi].groupby(
+        ['dteday', 'workingday'], observed=True, sort=False
+    ).agg({
+        'casual': 'sum',
+        'registered': 'sum',
+        'cnt': 'sum'
+    }).reset_index()
     
-    # Wind speed plot
-    fig_wind = px.scatter(
-        filtered_df,
-        x='windspeed',
-        y='cnt',
-        color='weather_desc',
-        title="Wind Speed vs Total Rentals",
-        labels={
-            'windspeed': 'Wind Speed (Normalized)',
-            'cnt': 'Total Rentals',
-            'weather_desc': 'Weather Condition'
-        },
-        opacity=0.6
+    # Split once into per-day-type column arrays that plot traces take as is
+    wd = daily_data['workingday'].to_numpy() == 1
+    return {
+        day_type: {col: daily_data[col].to_numpy()[mask]
+                   for col in ['dteday', 'casual', 'registered', 'cnt']}
+        for day_type, mask in [('working', wd), ('nonworking', ~wd)]
+    }
+
+weather_vars = ['temp', 'atemp', 'hum', 'windspeed', 'cnt']
+
+@st.cache_data
+def compute_corr(lo, hi):
+    hour_df, _ = load_data()
+    arr = hour_df.loc[lo:hi][weather_vars].to_numpy(dtype=np.float32)
+    cm = np.corrcoef(arr, rowvar=False)
+    return pd.DataFrame(cm, index=weather_vars, columns=weather_vars)
+
+@st.cache_data
+def build_workingday_fig(lo, hi):
+    """Working-day scatter of total rentals, retargeted per user type."""
+    daily = compute_daily(lo, hi)
+    fig = go.Figure()
+
+    fig.add_trace(
+        go.Scattergl(
+            x=daily['working']['dteday'],
+            y=daily['working']['cnt'],
+            name="Working Day",
+            mode='markers',
+            marker=dict(color='blue', size=8),
+            hovertemplate="<b>Date:</b> %{x}<br><b>Users:</b> %{y}<br><b>Day Type:</b> Working Day<extra></extra>"
+        )
     )
-    st.plotly_chart(fig_wind, use_container_width=True)
 
-with tab3:
-    weather_vars = ['temp', 'atemp', 'hum', 'windspeed', 'cnt']
-    corr_matrix = filtered_df[weather_vars].corr()
+    fig.add_trace(
+        go.Scattergl(
+            x=daily['nonworking']['dteday'],
+            y=daily['nonworking']['cnt'],
+            name="Non-working Day",
+            mode='markers',
+            marker=dict(color='red', size=8),
+            hovertemplate="<b>Date:</b> %{x}<br><b>Users:</b> %{y}<br><b>Day Type:</b> Non-working Day<extra></extra>"
+        )
+    )
 
-    fig_corr = px.imshow(
-        corr_matrix,
-        labels=dict(color="Correlation"),
-        color_continuous_scale="RdBu",
-        title="Correlation between Weather Factors and Rentals"
+    fig.update_layout(
+        xaxis_title="Date",
+        hovermode='x unified',
+        showlegend=True,
+        legend=dict(
+            yanchor="top",
+            y=0.99,
+            xanchor="right",
+            x=0.99,
+            bgcolor="rgba(255, 255, 255, 0.8)",
+            bordercolor="rgba(0, 0, 0, 0.3)",
+            borderwidth=1
+        )
     )
-    st.plotly_chart(fig_corr, use_container_width=True)
 
-with tab4:
-    # Add weather category
-    filtered_df['weather_category'] = filtered_df.apply(categorize, axis=1)
+    return fig.to_dict()
+
+def render_workingday_section(df, lo, hi, user_type):
+    st.subheader("Working days Impact Analysis")
+    tot, cas, reg = df[['cnt', 'casual', 'registered']].to_numpy().sum(axis=0, dtype=np.int64)
+
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("Total Users", f"{tot:,}")
+    with col2:
+        st.metric("Casual Users", f"{cas:,}")
+    with col3:
+        st.metric("Registered Users", f"{reg:,}")
+
+    # Modify the chart based on user type selection
+    if user_type == "All":
+        y_column = 'cnt'
+        title_suffix = "Total"
+    elif user_type == "Casual":
+        y_column = 'casual'
+        title_suffix = "Casual"
+    else:
+        y_column = 'registered'
+        title_suffix = "Registered"
+
+    # Only the y-values and titles depend on the user type
+    fig_workingday = go.Figure(build_workingday_fig(lo, hi))
+    if y_column != 'cnt':
+        daily = compute_daily(lo, hi)
+        fig_workingday.data[0].y = daily['working'][y_column]
+        fig_workingday.data[1].y = daily['nonworking'][y_column]
+    fig_workingday.update_layout(
+        title=f"Daily Bike Rentals - {title_suffix} Users",
+        yaxis_title=f"Number of {title_suffix} Rentals"
+    )
+    st.plotly_chart(fig_workingday, key='workingday_chart', use_container_width=True)
+
+def render_weather_section(df, lo, hi):
+    st.subheader("Weather Impact Analysis")
+
+    tab1, tab2, tab3, tab4 = st.tabs(["Average Rentals by Weather", "Weather Factors vs Rentals", 
+                                     "Weather Rentals Correlation", "Advanced Analysis"])
+
+    # Box Plot
+    with tab1:
+        fig_weather = build_box_fig(
+            df,
+            'weather_desc',
+            "Rental Distribution by Weather Condition"
+        )
+        st.plotly_chart(fig_weather, use_container_width=True)
+
+    with tab2:
+        scatter_panels = [
+            ('temp', 'Temperature (Normalized)'),
+            ('hum', 'Humidity (Normalized)'),
+            ('windspeed', 'Wind Speed (Normalized)')
+        ]
+        fig_factors = make_subplots(
+            rows=1, cols=3, shared_yaxes=True,
+            subplot_titles=["Temperature", "Humidity", "Wind Speed"]
+        )
     
-    fig_category = px.box(
-        filtered_df,
-        x='weather_category',
-        y=['casual', 'registered', 'cnt'],
-        title="Rental Distribution by Weather Category",
-        labels={'value': 'Number of Rentals', 'variable': 'User Type'},
-        color_discrete_sequence=px.colors.qualitative.Set3,
-        category_orders={"weather_category": ["Ideal", "Good", "Moderate", "Poor"]}
+        # One trace per weather condition and panel, sharing a legend entry
+        colors = px.colors.qualitative.Plotly
+        shown = set()
+        for col_ix, (x_col, x_label) in enumerate(scatter_panels, start=1):
+            sample = downsample(df, x_col, 'cnt')
+            codes = sample['weather_desc'].cat.codes.to_numpy()
+            x_vals = sample[x_col].to_numpy()
+            y_vals = sample['cnt'].to_numpy()
+            for code, desc in enumerate(sample['weather_desc'].cat.categories):
+                sel = codes == code
+                if not sel.any():
+                    continue
+                fig_factors.add_trace(
+                    go.Scattergl(
+                        x=x_vals[sel],
+                        y=y_vals[sel],
+                        name=desc,
+                        legendgroup=desc,
+                        showlegend=desc not in shown,
+                        mode='markers',
+                        marker=dict(color=colors[code % len(colors)], opacity=0.6)
+                    ),
+                    row=1, col=col_ix
+                )
+                shown.add(desc)
+            fig_factors.update_xaxes(title_text=x_label, row=1, col=col_ix)
+    
+        fig_factors.update_yaxes(title_text="Total Rentals", row=1, col=1)
+        fig_factors.update_layout(
+            title="Weather Factors vs Total Rentals",
+            legend_title_text="Weather Condition"
+        )
+        st.plotly_chart(fig_factors, use_container_width=True)
+
+    with tab3:
+        corr_matrix = compute_corr(lo, hi)
+
+        fig_corr = go.Figure(go.Heatmap(
+            z=corr_matrix.to_numpy(),
+            x=weather_vars,
+            y=weather_vars,
+            colorscale="RdBu",
+            zmid=0,
+            colorbar=dict(title="Correlation")
+        ))
+        # Keep the first variable on the top row, as imshow did
+        fig_corr.update_yaxes(autorange='reversed')
+        fig_corr.update_layout(title="Correlation between Weather Factors and Rentals")
+        st.plotly_chart(fig_corr, use_container_width=True)
+
+    with tab4:
+        render_advanced_section(df)
+
+def render_advanced_section(df):
+    fig_category = build_box_fig(
+        df,
+        'weather_category',
+        "Rental Distribution by Weather Category"
     )
     st.plotly_chart(fig_category, use_container_width=True)
 
@@ -244,4 +384,34 @@ with tab4:
 
     4. "Poor" Category:\n
         If conditions don't meet any of the above criteria, it falls into the Poor category
-    """)
\ No newline at end of file
+    """)
+
+def main():
+    hour_df, day_df = load_data()
+
+    # Title
+    st.title("🚲 Bike Rental Analysis Dashboard")
+
+    # Sidebar filters
+    st.sidebar.header("Filters")
+    date_range = st.sidebar.date_input(
+        "Select Date Range",
+        value=(hour_df['dteday'].min(), hour_df['dteday'].max()),
+        min_value=hour_df['dteday'].min(),
+        max_value=hour_df['dteday'].max()
+    )
+
+    # Add user type filter
+    user_type = st.sidebar.selectbox(
+        "Select User Type",
+        ["All", "Casual", "Registered"]
+    )
+
+    lo, hi = str(date_range[0]), str(date_range[1])
+    filtered_df = hour_df.loc[lo:hi]
+
+    render_workingday_section(filtered_df, lo, hi, user_type)
+    render_weather_section(filtered_df, lo, hi)
+
+if __name__ == "__main__":
+    main()